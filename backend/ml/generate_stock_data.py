@@ -1,26 +1,26 @@
+import logging
 import os
 import mysql.connector
-import random
 from datetime import datetime, timedelta
-from decimal import Decimal
+from itertools import islice
+
+import numpy as np
+from dotenv import dotenv_values
+
+rng = np.random.default_rng()
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
 
 # Configuration setup
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ENV_PATH = os.path.join(BASE_DIR, '.env')
 
-def load_env():
-    env_vars = {}
-    try:
-        with open(ENV_PATH) as f:
-            for line in f:
-                if line.strip() and not line.startswith('#'):
-                    key, value = line.strip().split('=', 1)
-                    env_vars[key] = value.strip('"\'')
-    except FileNotFoundError:
-        print(f"Warning: .env file not found at {ENV_PATH}")
-    return env_vars
-
-env = load_env()
+# dotenv_values handles quoting/export/embedded '=' correctly and
+# parses the file in one pass; it returns {} when the file is missing.
+env = dotenv_values(ENV_PATH)
+if not env:
+    logger.warning(f".env file not found at {ENV_PATH}")
 
 # Database configuration
 db_config = {
@@ -39,118 +39,156 @@ base_prices = {
     'DIS': 95, 'V': 210
 }
 
+def fetch_stock_ids(cursor):
+    """Map each configured symbol to its stocks.id in a single query"""
+    placeholders = ", ".join(["%s"] * len(symbols))
+    cursor.execute(
+        f"SELECT id, symbol FROM stocks WHERE symbol IN ({placeholders})",
+        symbols
+    )
+    return {sym: sid for sid, sym in cursor.fetchall()}
+
 def clear_old_data(cursor):
     """Remove existing prediction data"""
     cursor.execute("DELETE FROM predictions")
-    print("Cleared previous prediction data")
+    logger.info("Cleared previous prediction data")
 
 def generate_new_data(cursor, start_date, days=100):
     """Generate fresh historical data"""
-    for day in range(days):
-        current_date = start_date + timedelta(days=day)
-        
-        for symbol in symbols:
-            cursor.execute("SELECT id FROM stocks WHERE symbol = %s", (symbol,))
-            result = cursor.fetchone()
-            if not result:
-                print(f"Warning: Stock {symbol} not found")
-                continue
-                
-            stock_id = result[0]
-            
-            # Convert base price to Decimal for precise calculations
-            base_price = Decimal(str(base_prices[symbol]))
-            trend = Decimal('0.001') * (Decimal('1') + Decimal(str(day))/Decimal('100'))
-            volatility = Decimal(str(random.uniform(0.01, 0.03)))
-            random_change = Decimal(str(random.uniform(-float(volatility), float(volatility))))
-            price = base_price * (Decimal('1') + trend + random_change)
-            
-            # Generate OHLCV data
-            open_price = round(float(price), 2)
-            close_price = round(float(price * (Decimal('1') + Decimal(str(random.uniform(-0.01, 0.01))))), 2)
-            high_price = round(max(open_price, close_price) * (1 + random.uniform(0, 0.015)), 2)
-            low_price = round(min(open_price, close_price) * (1 - random.uniform(0, 0.015)), 2)
-            volume = random.randint(5_000_000, 150_000_000)
-            
-            cursor.execute(
-                """INSERT INTO historical_data 
-                (stock_id, date, open_price, high_price, low_price, close_price, adj_close, volume)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                open_price=VALUES(open_price),
-                high_price=VALUES(high_price),
-                low_price=VALUES(low_price),
-                close_price=VALUES(close_price),
-                adj_close=VALUES(adj_close),
-                volume=VALUES(volume)""",
-                (stock_id, current_date.date(), open_price, high_price, low_price, 
-                 close_price, close_price, volume)
-            )
-        
-        print(f"Generated data for {current_date.date()}")
+    stock_id_by_symbol = fetch_stock_ids(cursor)
+    first_date = start_date.date()
+    dates = [first_date + timedelta(days=day) for day in range(days)]
+    trend = 0.001 * (1 + np.arange(days) / 100)
+
+    # Struct-of-arrays: one contiguous NumPy column per OHLCV field
+    # instead of a Python tuple per row.
+    stock_ids = []
+    open_cols, high_cols, low_cols, close_cols, volume_cols = [], [], [], [], []
 
-def generate_predictions(cursor):
-    """Generate new predictions with proper decimal handling"""
     for symbol in symbols:
-        cursor.execute("SELECT id FROM stocks WHERE symbol = %s", (symbol,))
-        result = cursor.fetchone()
-        if not result:
-            print(f"Warning: Stock {symbol} not found")
+        stock_id = stock_id_by_symbol.get(symbol)
+        if stock_id is None:
+            logger.warning(f"Stock {symbol} not found")
             continue
-            
-        stock_id = result[0]
-        
-        cursor.execute(
-            """SELECT AVG(close_price) FROM historical_data 
-            WHERE stock_id = %s AND date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)""",
-            (stock_id,)
-        )
-        avg_price = cursor.fetchone()[0]
-        
+
+        # Whole price path for this symbol in one vectorized pass
+        volatility = rng.uniform(0.01, 0.03, days)
+        price = base_prices[symbol] * (1 + trend + rng.uniform(-1, 1, days) * volatility)
+
+        open_price = price.round(2)
+        close_price = (price * (1 + rng.uniform(-0.01, 0.01, days))).round(2)
+        open_cols.append(open_price)
+        close_cols.append(close_price)
+        high_cols.append((np.maximum(open_price, close_price) * (1 + rng.uniform(0, 0.015, days))).round(2))
+        low_cols.append((np.minimum(open_price, close_price) * (1 - rng.uniform(0, 0.015, days))).round(2))
+        volume_cols.append(rng.integers(5_000_000, 150_000_001, days))
+        stock_ids.append(stock_id)
+
+        logger.debug("Generated data for %s", symbol)
+
+    if not stock_ids:
+        logger.warning("No matching stocks; nothing to insert")
+        return
+
+    logger.info(f"Generated {days * len(stock_ids)} historical rows")
+
+    # Rows only come into being at the executemany boundary: zip the
+    # columns and flush one multi-row statement per chunk.
+    close_col = np.concatenate(close_cols).tolist()
+    params = zip(
+        np.repeat(stock_ids, days).tolist(),
+        dates * len(stock_ids),
+        np.concatenate(open_cols).tolist(),
+        np.concatenate(high_cols).tolist(),
+        np.concatenate(low_cols).tolist(),
+        close_col,
+        close_col,
+        np.concatenate(volume_cols).tolist(),
+    )
+    insert_sql = """INSERT INTO historical_data
+        (stock_id, date, open_price, high_price, low_price, close_price, adj_close, volume)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+        open_price=VALUES(open_price),
+        high_price=VALUES(high_price),
+        low_price=VALUES(low_price),
+        close_price=VALUES(close_price),
+        adj_close=VALUES(adj_close),
+        volume=VALUES(volume)"""
+    while chunk := list(islice(params, 10_000)):
+        cursor.executemany(insert_sql, chunk)
+
+def generate_predictions(cursor):
+    """Generate new predictions from recent average prices"""
+    stock_id_by_symbol = fetch_stock_ids(cursor)
+    for symbol in symbols:
+        if symbol not in stock_id_by_symbol:
+            logger.warning(f"Stock {symbol} not found")
+    if not stock_id_by_symbol:
+        return
+
+    # One grouped aggregation for all stocks instead of a SELECT per symbol
+    stock_ids = list(stock_id_by_symbol.values())
+    placeholders = ", ".join(["%s"] * len(stock_ids))
+    cursor.execute(
+        f"""SELECT stock_id, AVG(close_price) FROM historical_data
+        WHERE stock_id IN ({placeholders})
+        AND date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+        GROUP BY stock_id""",
+        stock_ids
+    )
+    avg_price_by_id = dict(cursor.fetchall())
+
+    rows = []
+    for symbol, stock_id in stock_id_by_symbol.items():
+        avg_price = avg_price_by_id.get(stock_id)
         if avg_price is None:
-            print(f"No historical data found for {symbol}")
+            logger.warning(f"No historical data found for {symbol}")
             continue
-            
-        # Convert to float for calculation, then back to Decimal for storage
-        predicted_price = round(float(avg_price) * (1 + random.uniform(-0.05, 0.1)), 2)
-        confidence = round(random.uniform(70, 95), 2)
-        
-        cursor.execute(
-            """INSERT INTO predictions 
+
+        predicted_price = round(float(avg_price) * (1 + rng.uniform(-0.05, 0.1)), 2)
+        confidence = round(rng.uniform(70, 95), 2)
+        rows.append((stock_id, predicted_price, confidence))
+
+    if rows:
+        cursor.executemany(
+            """INSERT INTO predictions
             (stock_id, prediction_date, predicted_price, confidence_score, algorithm_used)
             VALUES (%s, CURDATE(), %s, %s, 'random_forest')""",
-            (stock_id, Decimal(str(predicted_price)), Decimal(str(confidence)))
+            rows
         )
-    
-    print("Generated new predictions")
+
+    logger.info("Generated new predictions")
 
 def main():
     try:
         conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
+        # Prepared cursor: each repeated statement is parsed once server-side
+        # and only parameters ship per execution.
+        cursor = conn.cursor(prepared=True)
         
-        print("Successfully connected to database")
+        logger.info("Successfully connected to database")
         
         clear_old_data(cursor)
         generate_new_data(cursor, datetime.now() - timedelta(days=100))
         generate_predictions(cursor)
         
         conn.commit()
-        print("Successfully updated database")
+        logger.info("Successfully updated database")
         
     except mysql.connector.Error as err:
-        print(f"Database error: {err}")
+        logger.error(f"Database error: {err}")
         if 'conn' in locals():
             conn.rollback()
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        logger.error(f"Unexpected error: {e}")
         if 'conn' in locals():
             conn.rollback()
     finally:
         if 'conn' in locals() and conn.is_connected():
             cursor.close()
             conn.close()
-            print("Database connection closed")
+            logger.info("Database connection closed")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file